@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import json
 import os
 from contextlib import AsyncExitStack
 from typing import List, Optional
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from app.tool.mcp_tool import MCPClients
 
@@ -38,7 +39,8 @@ Remember to clearly explain your reasoning and actions to the user.
         """
 
     def __init__(self):
-        self.openai = OpenAI(
+        # 异步客户端的连接池绑定到首次使用它的事件循环，不能在多次 asyncio.run 之间共享，每个实例单独创建
+        self.openai = AsyncOpenAI(
             api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL")
         )
         self.model = os.getenv("OPENAI_MODEL")
@@ -92,7 +94,7 @@ Remember to clearly explain your reasoning and actions to the user.
     
 
     async def get_response(self, messages: list, tools: list = None):
-        response = self.openai.chat.completions.create(
+        response = await self.openai.chat.completions.create(
             model=self.model,
             max_tokens=1000,
             messages=messages,
@@ -115,28 +117,32 @@ Remember to clearly explain your reasoning and actions to the user.
             # 如果不调用工具，则添加到 final_text 中
             if not is_function_call:
                 final_text.append(message.content)
-            # 如果是工具调用，则获取工具名称和输入
-            else:
-               
-                # 解包tool_calls
-                tool_name = message.tool_calls[0].function.name
-                tool_args = json.loads(message.tool_calls[0].function.arguments)
+                continue
+
+            # 解包tool_calls
+            calls = [
+                (tool_call.function.name, json.loads(tool_call.function.arguments))
+                for tool_call in message.tool_calls
+            ]
+            for tool_name, tool_args in calls:
                 print(f"准备调用工具: {tool_name}")
                 print(f"参数: {json.dumps(tool_args, ensure_ascii=False, indent=2)}")
-                # 执行工具调用，获取结果
-                # result = await self.session.call_tool(tool_name, tool_args)
-                result = await self.mcp_clients.session.call_tool(tool_name, tool_args)
+            # 并发执行所有工具调用，获取结果
+            results = await asyncio.gather(
+                *(self.mcp_clients.session.call_tool(tool_name, tool_args) for tool_name, tool_args in calls)
+            )
+            # 继续与工具结果进行对话
+            if message.content and hasattr(message.content, "text"):
+                messages.append({"role": "assistant", "content": message.content})
+            for (tool_name, tool_args), result in zip(calls, results):
                 tool_results.append({"call": tool_name, "result": result})
                 final_text.append(f"[Calling tool {tool_name} with args {tool_args}]")
-                # 继续与工具结果进行对话
-                if message.content and hasattr(message.content, "text"):
-                    messages.append({"role": "assistant", "content": message.content})
                 # 将工具调用结果添加到消息
                 messages.append({"role": "user", "content": result.content})
-                # 获取下一个LLM响应
-                response = self.get_response(messages,available_tools)
-                # 将结果添加到 final_text
-                if response.choices[0].message.content:
-                    final_text.append(response.choices[0].message.content)
+            # 获取下一个LLM响应
+            response = await self.get_response(messages,available_tools)
+            # 将结果添加到 final_text
+            if response.choices[0].message.content:
+                final_text.append(response.choices[0].message.content)
 
-        return "\\n".join(final_text)
+        return "\n".join(final_text)
@@ -1,14 +1,15 @@
 
 from typing import List
 
-import tiktoken
-import yaml
-
 from app.prompt.outline.generate_outline_edit_opinion import SYSTEM_PROMPT_OUTLINE_EDIT_OPINION, \
     USER_PROMPT_OUTLINE_EDIT_OPINION
 from app.report_info import ReportInfo
 from llm.schema import Message, Memory
-from company.agent.token_counter import TokenCounter
+from company.agent.token_counter import get_tokenizer, get_token_counter
+from company.utils.yaml_utils import load_yaml
+
+# 系统提示词为类常量，Message 只构建一次，各实例共享
+_SYSTEM_MESSAGE = Message.system_message(SYSTEM_PROMPT_OUTLINE_EDIT_OPINION)
 
 
 class ReportGenerateOutlineEditOpinionAgent:
@@ -30,23 +31,11 @@ class ReportGenerateOutlineEditOpinionAgent:
         self.max_input_tokens = llm.config.max_tokens
         # 正确初始化 Memory 实例
         self.memory = Memory()
-        # 修复：应该使用 self.memory 而不是 self.messages
-        messages = [
-            Message.system_message(  # 修复：应该使用 system_message 而不是 user_message
-                self.system_prompt
-            )
-        ]
-        self.memory.add_messages(messages)
-        
-        # 修复 tokenizer 初始化问题
-        try:
-            self.tokenizer = tiktoken.encoding_for_model(self.llm.config.model)
-        except KeyError:
-            # 如果模型不被支持，使用默认的 cl100k_base 编码（适用于大多数现代模型）
-            self.logger.warning(f"模型 {self.llm.config.model} 不被 tiktoken 支持，使用默认编码 cl100k_base")
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
-        
-        self.token_counter = TokenCounter(self.tokenizer)
+        self.memory.add_messages([_SYSTEM_MESSAGE])
+
+        # tokenizer 按模型缓存，避免每个实例重复加载 BPE 表
+        self.tokenizer = get_tokenizer(self.llm.config.model)
+        self.token_counter = get_token_counter(self.llm.config.model)
 
     def generate_outline_opinion(self,report_info:ReportInfo):
 
@@ -73,22 +62,20 @@ class ReportGenerateOutlineEditOpinionAgent:
             part_title=report_info.report_title,
             outline_content=part,
         )
-        messages = [
+        # 每次调用只保留系统消息和本轮提示词，避免多轮讨论时提示词累积
+        self.memory.messages = [
+            _SYSTEM_MESSAGE,
             Message.user_message(
                 user_prompt
             )
         ]
-        self.memory.add_messages(messages)
-        self_messages = self.messages
-        # 修复：将 Message 对象转换为 dict 格式
-        messages_dict = [msg.to_dict() for msg in self_messages]
-        input_tokens = self.count_message_tokens(messages_dict)
-        self.logger.info(f"📋 输入tokens:{input_tokens}")
+        input_tokens = self.count_message_tokens(self.memory.messages)
+        self.logger.info("📋 输入tokens:%s", input_tokens)
         # if not self.check_token_limit(input_tokens):
         #     error_message = self.get_limit_error_message(input_tokens)
         #     # Raise a special exception that won't be retried
         #     raise ValueError(error_message)
-        self.logger.info(f"📋 提示词:{ self.memory.messages}")
+        self.logger.info("📋 提示词:%s", self.memory.messages)
 
         # 修复：应该传递 self.memory.messages 而不是 self.messages
         response = self.llm.ask(
@@ -96,23 +83,19 @@ class ReportGenerateOutlineEditOpinionAgent:
             temperature=0.3
         )
 
-        self.logger.info(f"📋 已生成研报大纲意见：{response}")
+        self.logger.info("📋 已生成研报大纲意见：%s", response)
         try:
-            if '```yaml' in response:
-                yaml_block = response.split('```yaml')[1].split('```')[0]
-            else:
-                yaml_block = response
-            result = yaml.safe_load(yaml_block)
+            result = load_yaml(response)
             if isinstance(result, dict):
                 result = list(result.values())
-            self.logger.info(f"📄 生成大纲意见 内容: {result}")
+            self.logger.info("📄 生成大纲意见 内容: %s", result)
             report_info.report_outline_opinion = result
             return result
         except Exception as e:
             self.logger.error(f"[大纲意见yaml解析失败] {e}")
             return []
 
-    def count_message_tokens(self, messages: List[dict]) -> int:
+    def count_message_tokens(self, messages: List[Message]) -> int:
         return self.token_counter.count_message_tokens(messages)
 
     def check_token_limit(self, input_tokens: int) -> bool:
@@ -1,9 +1,7 @@
-
-import yaml
-
 from typing import Optional, Any, Mapping, Dict
 from app.report_info import ReportInfo
 from app.schema import Message
+from company.utils.yaml_utils import load_yaml
 
 class GenerateOutlineAgent:
     system_prompt: str = """
@@ -40,7 +38,7 @@ class GenerateOutlineAgent:
     【数据库相关信息】
       {report_info.rag_context}
     """
-        self.logger.info(f"📋 修改研报提示词{user_prompt}")
+        self.logger.info("📋 修改研报提示词%s", user_prompt)
         self.messages.append(
             Message.user_message(
                 user_prompt
@@ -54,14 +52,10 @@ class GenerateOutlineAgent:
         )
 
         try:
-            if '```yaml' in outline_list:
-                yaml_block = outline_list.split('```yaml')[1].split('```')[0]
-            else:
-                yaml_block = outline_list
-            parts = yaml.safe_load(yaml_block)
+            parts = load_yaml(outline_list)
             if isinstance(parts, dict):
                 parts = list(parts.values())
-            self.logger.info(f"📄 生成研报大纲 内容: {parts}")
+            self.logger.info("📄 生成研报大纲 内容: %s", parts)
             return parts
         except Exception as e:
             self.logger.error(f"[大纲yaml解析失败] {e}")
@@ -1,9 +1,7 @@
-
-import yaml
-
 from typing import Optional, Any, Mapping, Dict
 from app.report_info import ReportInfo
 from app.schema import Message
+from company.utils.yaml_utils import load_yaml
 
 class AgainGenerateOutlineAgent:
     role: str = """你是一位顶级金融分析师和研报撰写首席研究员"""
@@ -50,15 +48,11 @@ class AgainGenerateOutlineAgent:
         )
 
         try:
-            if '```yaml' in outline_list:
-                yaml_block = outline_list.split('```yaml')[1].split('```')[0]
-            else:
-                yaml_block = outline_list
-            parts = yaml.safe_load(yaml_block)
+            parts = load_yaml(outline_list)
             if isinstance(parts, dict):
                 parts = list(parts.values())
 
-            self.logger.info(f"📄 生成研报大纲意见 内容: {parts}")
+            self.logger.info("📄 生成研报大纲意见 内容: %s", parts)
             return parts
         except Exception as e:
             self.logger.error(f"[生成研报大纲意见yaml解析失败] {e}")
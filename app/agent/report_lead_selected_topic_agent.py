@@ -1,8 +1,7 @@
-import yaml
-
 from typing import Optional, Any, Mapping, Dict
 from app.report_info import ReportInfo
 from app.schema import Message
+from company.utils.yaml_utils import load_yaml
 
 
 class SelectedTopicAgent:
@@ -50,11 +49,7 @@ class SelectedTopicAgent:
         )
 
         try:
-            if '```yaml' in outline_list:
-                yaml_block = outline_list.split('```yaml')[1].split('```')[0]
-            else:
-                yaml_block = outline_list
-            parts = yaml.safe_load(yaml_block)
+            parts = load_yaml(outline_list)
             if isinstance(parts, dict):
                 parts = list(parts.values())
             return parts
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict, Type
 
 from company.agent.outline.outline_generator_part import OutlineGeneratorPart
 from company.agent.outline.outline_opinion_generator_part import OutlineOpinionGeneratorPart
@@ -22,24 +23,24 @@ class OutlineAgentType(Enum):
     PART_OPINION_GENERATOR_PART = "part_opinion_generator_part"
     PART_ABSTRACT_GENERATOR_PART = "part_abstract_generator_part"
 
+
+# Agent 类型到实现类的映射
+_AGENT_CLASSES: Dict[OutlineAgentType, Type[BaseOutlineAgent]] = {
+    OutlineAgentType.OUTLINE_GENERATOR_PART: OutlineGeneratorPart,
+    OutlineAgentType.OUTLINE_OPINION_GENERATOR_PART: OutlineOpinionGeneratorPart,
+    OutlineAgentType.PART_GENERATOR_PART: PartGeneratorPart,
+    OutlineAgentType.PART_OPINION_GENERATOR_PART: PartOpinionGeneratorPart,
+    OutlineAgentType.PART_ABSTRACT_GENERATOR_PART: PartAbstractGeneratorPart,
+}
+
+
 class OutlineAgentFactory:
     """大纲 Agent 工厂类"""
     
     @staticmethod
     def create_agent(agent_type: OutlineAgentType, logger, llm) -> BaseOutlineAgent:
         """创建指定类型的 Agent"""
-
-        if agent_type == OutlineAgentType.OUTLINE_GENERATOR_PART:
-            return OutlineGeneratorPart(logger, llm)
-        elif agent_type == OutlineAgentType.OUTLINE_OPINION_GENERATOR_PART:
-            return OutlineOpinionGeneratorPart(logger, llm)
-        elif agent_type == OutlineAgentType.PART_GENERATOR_PART:
-            return PartGeneratorPart(logger, llm)
-        elif agent_type == OutlineAgentType.PART_OPINION_GENERATOR_PART:
-            return PartOpinionGeneratorPart(logger, llm)
-        elif agent_type == OutlineAgentType.PART_ABSTRACT_GENERATOR_PART:
-            return PartAbstractGeneratorPart(logger, llm)
-
-
-        else:
-            raise ValueError(f"不支持的 Agent 类型: {agent_type}")
\ No newline at end of file
+        agent_class = _AGENT_CLASSES.get(agent_type)
+        if agent_class is None:
+            raise ValueError(f"不支持的 Agent 类型: {agent_type}")
+        return agent_class(logger, llm)
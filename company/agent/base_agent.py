@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
-import tiktoken
-import yaml
 from llm.schema import Message, Memory
-from company.agent.token_counter import TokenCounter
+from company.agent.llm_cache import get_response_cache, make_cache_key
+from company.agent.token_counter import get_tokenizer, get_token_counter, fit_text_tokens
+from company.utils.yaml_utils import load_yaml
 from app.report_info import ReportInfo
 
 class BaseOutlineAgent(ABC):
@@ -16,6 +16,8 @@ class BaseOutlineAgent(ABC):
         self.total_input_tokens = 0
         self.total_completion_tokens = 0
         self.max_input_tokens = llm.config.max_tokens
+        # 相同提示词的 LLM 响应缓存，所有 Agent 共享
+        self.response_cache = get_response_cache()
         
         # 统一使用 Memory 管理消息
         self.memory = Memory()
@@ -26,42 +28,76 @@ class BaseOutlineAgent(ABC):
         
     def _initialize_memory(self):
         """初始化消息记忆"""
-        messages = [Message.system_message(self.system_prompt)]
-        self.memory.add_messages(messages)
+        # 系统消息在各次调用间不变，只构建一次
+        self._system_message = Message.system_message(self.system_prompt)
+        self.memory.add_messages([self._system_message])
         
     def _initialize_tokenizer(self):
-        """初始化 tokenizer"""
-        try:
-            self.tokenizer = tiktoken.encoding_for_model(self.llm.config.model)
-        except KeyError:
-            self.logger.warning(f"模型 {self.llm.config.model} 不被 tiktoken 支持，使用默认编码 cl100k_base")
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
-        
-        self.token_counter = TokenCounter(self.tokenizer)
+        """初始化 tokenizer，编码器与计数器按模型名在各 Agent 间共享"""
+        self.tokenizer = get_tokenizer(self.llm.config.model)
+        self.token_counter = get_token_counter(self.llm.config.model)
+        # 系统提示词固定不变，其 token 数只计算一次
+        self._system_tokens = self.token_counter.count_message(self._system_message)
     
     def _parse_yaml_response(self, response: str) -> List[Dict[str, Any]]:
         """统一的 YAML 解析逻辑"""
         try:
-            if '```yaml' in response:
-                yaml_block = response.split('```yaml')[1].split('```')[0]
-            else:
-                yaml_block = response
-            
-            result = yaml.safe_load(yaml_block)
+            result = load_yaml(response)
             if isinstance(result, dict):
                 result = list(result.values())
             
-            self.logger.info(f"📄 解析结果: {result}")
+            self.logger.info("📄 解析结果: %s", result)
             return result
         except Exception as e:
             self.logger.error(f"[YAML解析失败] {e}")
             return []
     
+    def _fit_context(self, text: str) -> str:
+        """将检索内容截断到 LLM 配置的 context_max_tokens 以内"""
+        if not text:
+            return text
+        return fit_text_tokens(self.llm.config.model, text, self.llm.config.context_max_tokens)
+
     def _count_tokens(self, messages: List[Message]) -> int:
-        """计算 token 数量"""
-        messages_dict = [msg.to_dict() for msg in messages]
-        return self.token_counter.count_message_tokens(messages_dict)
+        """计算 token 数量，首条为本 Agent 的系统消息时复用预先算好的 token 数"""
+        if messages and messages[0] is self._system_message:
+            return self._system_tokens + self.token_counter.count_message_tokens(messages[1:])
+        return self.token_counter.count_message_tokens(messages)
     
+    def _build_messages(self, user_prompt: str) -> List[Message]:
+        """构建单轮对话消息：系统消息 + 本次用户提示词"""
+        return [self._system_message, Message.user_message(user_prompt)]
+
+    def _ask_cached(self, messages: List[Message], temperature: float = 0.3,
+                    stop_at_yaml_end: bool = False) -> str:
+        """调用 LLM，相同提示词直接返回缓存的响应"""
+        key = make_cache_key(self.llm.config, messages, temperature, stop_at_yaml_end)
+        response = self.response_cache.get(key)
+        if response is not None:
+            self.logger.info("📋 命中响应缓存，跳过 LLM 调用")
+            return response
+
+        response = self.llm.ask(messages, temperature=temperature,
+                                stop_at_yaml_end=stop_at_yaml_end)
+        self.response_cache.set(key, response)
+        return response
+
+    async def _ask_async(self, user_prompt: str, temperature: float = 0.3,
+                         stop_at_yaml_end: bool = False) -> str:
+        """异步调用 LLM，不读写 self.memory，可在多个协程间并发"""
+        messages = self._build_messages(user_prompt)
+        key = make_cache_key(self.llm.config, messages, temperature, stop_at_yaml_end)
+        response = self.response_cache.get(key)
+        if response is not None:
+            self.logger.info("📋 命中响应缓存，跳过 LLM 调用")
+            return response
+
+        self.logger.info("📋 输入tokens: %s", self._count_tokens(messages))
+        response = await self.llm.async_ask(messages, temperature=temperature,
+                                            stop_at_yaml_end=stop_at_yaml_end)
+        self.response_cache.set(key, response)
+        return response
+
     def _check_token_limit(self, input_tokens: int) -> bool:
         """检查 token 限制"""
         if self.max_input_tokens is not None:
@@ -70,11 +106,10 @@ class BaseOutlineAgent(ABC):
     def _reset_memory(self) -> None:
         """重置内存并添加系统消息"""
         self.memory.clear()
-        messages = [Message.system_message(self.system_prompt)]
-        self.memory.add_messages(messages)
+        self.memory.add_messages([self._system_message])
 
     def _user_prompt(self,user_prompt):
-        self.logger.info(f"📄 用户提示词: {user_prompt}")
+        self.logger.debug("📄 用户提示词: %s", user_prompt)
 
     @property
     def messages(self) -> List[Message]:
@@ -0,0 +1,76 @@
+"""
+LLM 响应缓存
+"""
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Any, List, Optional
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+
+def make_cache_key(config: Any, messages: List[Any], temperature: float,
+                   stop_at_yaml_end: bool = False) -> str:
+    """按模型、接口地址、消息角色、内容和调用参数计算缓存 key，切换模型或接口后不会命中旧响应"""
+    digest = blake2b(digest_size=16)
+    digest.update(f"{config.model}|{config.base_url}|{config.max_tokens}".encode())
+    digest.update(b"\0")
+    for message in messages:
+        digest.update(message.role.encode())
+        digest.update(b"\0")
+        digest.update((message.content or "").encode())
+        digest.update(b"\0")
+    digest.update(f"{temperature}|{stop_at_yaml_end}".encode())
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """进程内 LRU 缓存，指定目录且安装了 diskcache 时同时持久化到磁盘，跨进程复用"""
+
+    def __init__(self, maxsize: int = 2000, directory: Optional[str] = None):
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._disk = diskcache.Cache(directory) if directory and diskcache is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存，未命中返回 None"""
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+        elif self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                self._remember(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """写入缓存，空响应（调用失败）不缓存"""
+        if not value:
+            return
+        self._remember(key, value)
+        if self._disk is not None:
+            self._disk.set(key, value)
+
+    def _remember(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> LLMResponseCache:
+    """所有 Agent 共享的响应缓存，设置 LLM_CACHE_DIR 时同时写入该目录"""
+    directory = os.getenv("LLM_CACHE_DIR")
+    return LLMResponseCache(directory=os.path.expanduser(directory) if directory else None)
@@ -6,8 +6,6 @@ from company.model.report_info import ReportInfo
 from company.prompt.outline.generate_outline_part import USER_PROMPT_OUTLINE_EDIT_PART, \
     USER_PROMPT_OUTLINE_EDIT_MODIFY_PART, SYSTEM_PROMPT_OUTLINE_PART_EDIT_PART
 
-from llm.schema import Message
-
 
 class OutlineGeneratorPart(BaseOutlineAgent):
     """大纲生成器"""
@@ -23,7 +21,7 @@ class OutlineGeneratorPart(BaseOutlineAgent):
             user_prompt = USER_PROMPT_OUTLINE_EDIT_MODIFY_PART.format(
                 target_company=report_info.target_company,
                 part_title=report_info.report_title,
-                report_data=report_info.rag_company,
+                report_data=self._fit_context(report_info.rag_company),
                 report_outline = report_info.report_outline,
                 report_outline_opinion=report_info.report_outline_opinion
             )
@@ -32,24 +30,23 @@ class OutlineGeneratorPart(BaseOutlineAgent):
             user_prompt = USER_PROMPT_OUTLINE_EDIT_PART.format(
                 target_company=report_info.target_company,
                 part_title=report_info.report_title,
-                report_data=report_info.rag_company,
+                report_data=self._fit_context(report_info.rag_company),
             )
-        self.logger.info(f"📋 生成大纲的提示词：{user_prompt}")
+        self.logger.debug("📋 生成大纲的提示词：%s", user_prompt)
         report_outline = self._execute_generation(user_prompt)
         report_info.report_outline = report_outline
         return report_outline
     
     def _execute_generation(self, user_prompt: str) -> List[Dict[str, Any]]:
         """执行生成逻辑"""
-        messages = [Message.user_message(user_prompt)]
-        self.memory.add_messages(messages)
+        # 每次调用都是独立的单轮对话，直接构建消息，不经过 memory
+        messages = self._build_messages(user_prompt)
         
         # Token 计算和检查
-        input_tokens = self._count_tokens(self.messages)
-        self.logger.info(f"📋 输入tokens: {input_tokens}")
+        input_tokens = self._count_tokens(messages)
+        self.logger.info("📋 输入tokens: %s", input_tokens)
         
         # 调用 LLM
-        response = self.llm.ask(self.memory.messages, temperature=0.3)
-        self.logger.info(f"📋 已生成研报大纲：{response}")
-        self._reset_memory()
+        response = self._ask_cached(messages, temperature=0.3, stop_at_yaml_end=True)
+        self.logger.info("📋 已生成研报大纲：%s", response)
         return self._parse_yaml_response(response)
\ No newline at end of file
@@ -4,7 +4,6 @@ from company.prompt.outline.generate_outline_edit_opinion_part import SYSTEM_PRO
     USER_PROMPT_OUTLINE_EDIT_OPINION_PART
 from company.model.report_info import ReportInfo
 
-from llm.schema import Message
 
 
 class OutlineOpinionGeneratorPart(BaseOutlineAgent):
@@ -28,20 +27,19 @@ class OutlineOpinionGeneratorPart(BaseOutlineAgent):
             target_company=report_info.target_company,
             part_title=report_info.report_title,
             report_outline=report_outline,
-            report_data=report_info.rag_context,
+            report_data=self._fit_context(report_info.rag_context),
         )
-        self.logger.info(f"📋 正在生成研报大纲意见: {user_prompt}")
-        messages = [Message.user_message(user_prompt)]
-        self.memory.add_messages(messages)
+        self.logger.debug("📋 正在生成研报大纲意见: %s", user_prompt)
+        # 每次调用都是独立的单轮对话，直接构建消息，不经过 memory
+        messages = self._build_messages(user_prompt)
         
-        input_tokens = self._count_tokens(self.messages)
-        self.logger.info(f"📋 输入tokens: {input_tokens}")
+        input_tokens = self._count_tokens(messages)
+        self.logger.info("📋 输入tokens: %s", input_tokens)
         
-        response = self.llm.ask(self.memory.messages, temperature=0.3)
-        self.logger.info(f"📋 已生成研报大纲意见：{response}")
+        response = self._ask_cached(messages, temperature=0.3, stop_at_yaml_end=True)
+        self.logger.info("📋 已生成研报大纲意见：%s", response)
         
         result = self._parse_yaml_response(response)
         report_info.report_outline_opinion = result
 
-        self._reset_memory()
         return result
\ No newline at end of file
@@ -2,7 +2,6 @@ from company.agent.base_agent import BaseOutlineAgent
 from company.prompt.parts.generate_part_abstract_part import SYSTEM_PROMPT_PART_ABSTRACT_PART, \
     USER_PROMPT_PART_ABSTRACT_PART
 from company.model.report_info import ReportInfo
-from llm.schema import Message
 
 
 class PartAbstractGeneratorPart(BaseOutlineAgent):
@@ -22,7 +21,7 @@ class PartAbstractGeneratorPart(BaseOutlineAgent):
         user_prompt = USER_PROMPT_PART_ABSTRACT_PART.format(
             report_text_list = report_text_list,
         )
-        self.logger.info(f"📋 生成正文章节摘要提示词: {user_prompt}")
+        self.logger.debug("📋 生成正文章节摘要提示词: %s", user_prompt)
 
         generation = self._execute_generation(user_prompt)
         report_info.cur_part_context.prev_part_content_abstract = generation
@@ -30,15 +29,14 @@ class PartAbstractGeneratorPart(BaseOutlineAgent):
     
     def _execute_generation(self, user_prompt: str) -> str:
         """执行生成逻辑"""
-        messages = [Message.user_message(user_prompt)]
-        self.memory.add_messages(messages)
+        # 每次调用都是独立的单轮对话，直接构建消息，不经过 memory
+        messages = self._build_messages(user_prompt)
         
         # Token 计算和检查
-        input_tokens = self._count_tokens(self.messages)
-        self.logger.info(f"📋 输入tokens: {input_tokens}")
+        input_tokens = self._count_tokens(messages)
+        self.logger.info("📋 输入tokens: %s", input_tokens)
         
         # 调用 LLM
-        response = self.llm.ask(self.memory.messages, temperature=0.3)
-        self.logger.info(f"📋 已正文章节摘要：{response}")
-        self._reset_memory()
+        response = self._ask_cached(messages, temperature=0.3)
+        self.logger.info("📋 已正文章节摘要：%s", response)
         return response
\ No newline at end of file
@@ -1,8 +1,8 @@
 from company.agent.base_agent import BaseOutlineAgent
 from company.prompt.parts.generate_part_edit_part import USER_PROMPT_PART_EDIT_PART, \
-    USER_PROMPT_PART_EDIT_MODIFY_PART, SYSTEM_PROMPT_PART_EDIT_PART, USER_PROMPT_PART_EDIT_END_PART
+    USER_PROMPT_PART_EDIT_MODIFY_PART, SYSTEM_PROMPT_PART_EDIT_PART, USER_PROMPT_PART_EDIT_END_PART, \
+    FINAL_SECTION_REFERENCES_SUFFIX
 from company.model.report_info import ReportInfo
-from llm.schema import Message
 
 
 class PartGeneratorPart(BaseOutlineAgent):
@@ -12,7 +12,24 @@ class PartGeneratorPart(BaseOutlineAgent):
         super().__init__(logger, llm, SYSTEM_PROMPT_PART_EDIT_PART)
     
     def generate(self, report_info: ReportInfo, **kwargs) -> str:
+        user_prompt = self._build_user_prompt(report_info)
+        generation = self._execute_generation(user_prompt)
+        self._save_generation(report_info, generation)
+        return generation
+
+    async def generate_async(self, report_info: ReportInfo, **kwargs) -> str:
+        """异步生成正文，供多个章节并发调用"""
+        user_prompt = self._build_user_prompt(report_info)
+        generation = await self._ask_async(user_prompt, temperature=0.3)
+        self.logger.info("📋 已生成正文：%s", generation)
+        self._save_generation(report_info, generation)
+        return generation
+
+    def _build_user_prompt(self, report_info: ReportInfo) -> str:
+        """根据当前章节上下文选择并填充正文提示词"""
         prompt_input = report_info.get_user_prompt_part_input()
+        # 检索内容按 token 预算截断后再拼入提示词
+        prompt_input['report_data'] = self._fit_context(prompt_input['report_data'])
         # part = report_info.map_dict_to_cur_part()
 
         # 修复：添加空格
@@ -29,13 +46,7 @@ class PartGeneratorPart(BaseOutlineAgent):
                 self.logger.info("📋 正在生成最后正文...")
                 user_prompt = USER_PROMPT_PART_EDIT_END_PART.format(
                     **prompt_input
-                )
-                user_prompt += """
-                   请在本节最后以"##  引用文献"格式，列出所有正文中用到的参考资料，格式如下：
-                   [1] 东方财富-港股-财务报表: https://emweb.securities.eastmoney.com/PC_HKF10/FinancialAnalysis/index
-                   [2] 同花顺-主营介绍: https://basic.10jqka.com.cn/new/000066/operate.html
-                   [3] 同花顺-股东信息: https://basic.10jqka.com.cn/HK0020/holder.html
-                   """
+                ) + FINAL_SECTION_REFERENCES_SUFFIX
             else:
                 self.logger.info("📋 正在生成初始正文...")
                 user_prompt = USER_PROMPT_PART_EDIT_PART.format(
@@ -43,24 +54,25 @@ class PartGeneratorPart(BaseOutlineAgent):
                 )
 
 
-        self.logger.info(f"📋 生成正文提示词: {user_prompt}")
+        self.logger.debug("📋 生成正文提示词: %s", user_prompt)
+        return user_prompt
 
-        generation = self._execute_generation(user_prompt)
+    @staticmethod
+    def _save_generation(report_info: ReportInfo, generation: str) -> None:
+        """将生成的正文写回当前章节上下文"""
         report_info.cur_part_context.cur_subsection_content = generation
         report_info.cur_part_context.cur_content = generation
-        return generation
     
     def _execute_generation(self, user_prompt: str) -> str:
         """执行生成逻辑"""
-        messages = [Message.user_message(user_prompt)]
-        self.memory.add_messages(messages)
+        # 每次调用都是独立的单轮对话，直接构建消息，不经过 memory
+        messages = self._build_messages(user_prompt)
         
         # Token 计算和检查
-        input_tokens = self._count_tokens(self.messages)
-        self.logger.info(f"📋 输入tokens: {input_tokens}")
+        input_tokens = self._count_tokens(messages)
+        self.logger.info("📋 输入tokens: %s", input_tokens)
         
         # 调用 LLM
-        response = self.llm.ask(self.memory.messages, temperature=0.3)
-        self.logger.info(f"📋 已生成正文：{response}")
-        self._reset_memory()
+        response = self._ask_cached(messages, temperature=0.3)
+        self.logger.info("📋 已生成正文：%s", response)
         return response
\ No newline at end of file
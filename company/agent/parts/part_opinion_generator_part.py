@@ -1,11 +1,14 @@
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from company.agent.base_agent import BaseOutlineAgent
 from company.model.report_info import ReportInfo
 from company.prompt.parts.generate_part_edit_opinion_part import USER_PROMPT_PART_EDIT_OPINION_PART, \
     SYSTEM_PROMPT_PART_EDIT_OPINION_PART
-from llm.schema import Message
+
+
+# 评审认为无需修改时的输出，去掉首尾引号和句号后比较
+_NO_CHANGE_RESPONSES = ("无", "None")
 
 
 class PartOpinionGeneratorPart(BaseOutlineAgent):
@@ -14,29 +17,52 @@ class PartOpinionGeneratorPart(BaseOutlineAgent):
     def __init__(self, logger, llm):
         super().__init__(logger, llm, SYSTEM_PROMPT_PART_EDIT_OPINION_PART)
     
-    def generate(self, report_info: ReportInfo, **kwargs) -> List[Dict[str, Any]]:
-        """生成文章正文意见"""
+    def generate(self, report_info: ReportInfo, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """生成文章正文意见，评审认为无需修改时返回 None"""
         if not report_info.cur_part_context.cur_content:
             self.logger.info("无正文内容意见，跳过")
             return []
+
+        user_prompt = self._build_user_prompt(report_info)
+        # 每次调用都是独立的单轮对话，直接构建消息，不经过 memory
+        messages = self._build_messages(user_prompt)
+        
+        input_tokens = self._count_tokens(messages)
+        self.logger.info("📋 输入tokens: %s", input_tokens)
         
+        response = self._ask_cached(messages, temperature=0.3, stop_at_yaml_end=True)
+        return self._save_opinion(report_info, response)
+
+    async def generate_async(self, report_info: ReportInfo, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """异步生成文章正文意见，供多个章节并发调用"""
+        if not report_info.cur_part_context.cur_content:
+            self.logger.info("无正文内容意见，跳过")
+            return []
+
+        user_prompt = self._build_user_prompt(report_info)
+        response = await self._ask_async(user_prompt, temperature=0.3, stop_at_yaml_end=True)
+        return self._save_opinion(report_info, response)
+
+    def _build_user_prompt(self, report_info: ReportInfo) -> str:
+        """填充正文意见提示词"""
         self.logger.info("📋 正在生成正文内容意见...")
         user_input = report_info.get_user_prompt_part_input()
         user_prompt = USER_PROMPT_PART_EDIT_OPINION_PART.format(
             **user_input
         )
-        self.logger.info(f"📋 正在生成正文内容意见: {user_prompt}")
-        messages = [Message.user_message(user_prompt)]
-        self.memory.add_messages(messages)
-        
-        input_tokens = self._count_tokens(self.messages)
-        self.logger.info(f"📋 输入tokens: {input_tokens}")
-        
-        response = self.llm.ask(self.memory.messages, temperature=0.3)
-        self.logger.info(f"📋 已生成正文内容意见：{response}")
-        
+        self.logger.debug("📋 正在生成正文内容意见: %s", user_prompt)
+        return user_prompt
+
+    def _save_opinion(self, report_info: ReportInfo, response: str) -> Optional[List[Dict[str, Any]]]:
+        """解析意见并写回当前章节上下文"""
+        self.logger.info("📋 已生成正文内容意见：%s", response)
+
+        if response.strip().strip('"“”。.') in _NO_CHANGE_RESPONSES:
+            self.logger.info("📋 正文无需修改")
+            report_info.cur_part_context.cur_subsection_content_opinion = []
+            return None
+
         result = self._parse_yaml_response(response)
         report_info.cur_part_context.cur_subsection_content_opinion = result
 
-        self._reset_memory()
-        return result
\ No newline at end of file
+        return result
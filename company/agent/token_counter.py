@@ -1,8 +1,39 @@
 
+import logging
 import math
-from typing import Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
 
+import tiktoken
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def get_tokenizer(model: str):
+    """按模型名缓存 tiktoken 编码器，不被支持的模型使用默认编码 cl100k_base"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # 结果按模型名缓存，同一模型只提示一次
+        logger.warning("模型 %s 不被 tiktoken 支持，使用默认编码 cl100k_base", model)
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@lru_cache(maxsize=8)
+def get_token_counter(model: str) -> "TokenCounter":
+    """按模型名缓存 TokenCounter"""
+    return TokenCounter(get_tokenizer(model))
+
+
+@lru_cache(maxsize=32)
+def fit_text_tokens(model: str, text: str, max_tokens: int) -> str:
+    """按 token 数截断文本，检索内容在整份报告中反复使用，结果按文本缓存"""
+    tokens = get_tokenizer(model).encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    # 按 token 截断可能把多字节字符切成两半，解码后末尾残留替换字符，去掉它
+    return get_tokenizer(model).decode(tokens[:max_tokens]).rstrip("\ufffd")
 
 
 class TokenCounter:
@@ -17,12 +48,27 @@ class TokenCounter:
     HIGH_DETAIL_TARGET_SHORT_SIDE = 768
     TILE_SIZE = 512
 
+    # Maximum number of distinct texts whose token counts are remembered
+    TEXT_CACHE_SIZE = 256
+
     def __init__(self, tokenizer):
         self.tokenizer = tokenizer
+        # System prompts and context blocks are counted again on every call,
+        # so remember counts per text instead of re-encoding them
+        self._text_tokens: Dict[str, int] = {}
 
     def count_text(self, text: str) -> int:
         """Calculate tokens for a text string"""
-        return 0 if not text else len(self.tokenizer.encode(text))
+        if not text:
+            return 0
+        tokens = self._text_tokens.get(text)
+        if tokens is None:
+            tokens = len(self.tokenizer.encode(text))
+            if len(self._text_tokens) >= self.TEXT_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._text_tokens[next(iter(self._text_tokens))]
+            self._text_tokens[text] = tokens
+        return tokens
 
     def count_image(self, image_item: dict) -> int:
         """
@@ -114,28 +160,59 @@ class TokenCounter:
                 token_count += self.count_text(function.get("arguments", ""))
         return token_count
 
-    def count_message_tokens(self, messages: List[dict]) -> int:
-        """Calculate the total number of tokens in a message list"""
+    def count_message_tokens(self, messages: List[Union[dict, Any]]) -> int:
+        """Calculate the total number of tokens in a message list
+
+        Accepts plain dicts or Message objects; Message fields are read
+        directly so no intermediate dict is built per call.
+        """
         total_tokens = self.FORMAT_TOKENS  # Base format tokens
 
         for message in messages:
-            tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+            total_tokens += self.count_message(message)
 
-            # Add role tokens
-            tokens += self.count_text(message.get("role", ""))
+        return total_tokens
 
-            # Add content tokens
-            if "content" in message:
-                tokens += self.count_content(message["content"])
+    def count_message(self, message: Union[dict, Any]) -> int:
+        """Calculate tokens for a single message, without the list format tokens"""
+        if isinstance(message, dict):
+            return self._count_dict_message_tokens(message)
+        return self._count_object_message_tokens(message)
 
-            # Add tool calls tokens
-            if "tool_calls" in message:
-                tokens += self.count_tool_calls(message["tool_calls"])
+    def _count_dict_message_tokens(self, message: dict) -> int:
+        """Calculate tokens for a message in dict format"""
+        tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
 
-            # Add name and tool_call_id tokens
-            tokens += self.count_text(message.get("name", ""))
-            tokens += self.count_text(message.get("tool_call_id", ""))
+        # Add role tokens
+        tokens += self.count_text(message.get("role", ""))
 
-            total_tokens += tokens
+        # Add content tokens
+        if "content" in message:
+            tokens += self.count_content(message["content"])
 
-        return total_tokens
+        # Add tool calls tokens
+        if "tool_calls" in message:
+            tokens += self.count_tool_calls(message["tool_calls"])
+
+        # Add name and tool_call_id tokens
+        tokens += self.count_text(message.get("name", ""))
+        tokens += self.count_text(message.get("tool_call_id", ""))
+
+        return tokens
+
+    def _count_object_message_tokens(self, message: Any) -> int:
+        """Calculate tokens for a Message object without calling to_dict()"""
+        tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+
+        tokens += self.count_text(message.role)
+        tokens += self.count_content(message.content)
+
+        if message.tool_calls:
+            for tool_call in message.tool_calls:
+                tokens += self.count_text(tool_call.function.name)
+                tokens += self.count_text(tool_call.function.arguments)
+
+        tokens += self.count_text(message.name)
+        tokens += self.count_text(message.tool_call_id)
+
+        return tokens
@@ -0,0 +1,20 @@
+"""
+大纲章节编号索引
+"""
+from typing import Any, Dict, List, Tuple
+
+
+class OutlineIndex:
+    """按 part_num 预先建立的大纲索引，大纲不变时各处查询共用同一份"""
+
+    def __init__(self, report_outline: List[Dict[str, Any]]):
+        nums = [str(part.get("part_num", "")) for part in report_outline]
+        # 收集所有编号的上级编号，如 "1.2.3" 的上级为 "1" 和 "1.2"，线性时间内完成
+        parent_nums = set()
+        for num in nums:
+            dot = num.find(".")
+            while dot != -1:
+                parent_nums.add(num[:dot])
+                dot = num.find(".", dot + 1)
+        # 是否是父节点（是否有以当前编号为前缀的其他编号），只读，避免调用方修改缓存
+        self.is_parent: Tuple[bool, ...] = tuple(num in parent_nums for num in nums)
@@ -1,55 +1,143 @@
-from typing import Optional, Any, Mapping, Dict, List
+import copy
+from typing import Optional, Any, Mapping, Dict, List, Tuple
 
+from company.model.outline_index import OutlineIndex
 from company.utils.content_convert import ContentConvert
 
 
 class CurPart:
 
-    is_part_last: bool = False
+    # 章节上下文在生成过程中被频繁读写，使用 __slots__ 省去实例字典；属性默认值在 __init__ 中设置
+    __slots__ = (
+        "is_part_last", "is_subsection_last", "is_report_last", "all_parts_num",
+        "prev_part_num", "prev_part", "prev_part_content", "prev_part_content_abstract",
+        "prev_subsection", "prev_subsection_content",
+        "cur_part_num", "_cur_part", "cur_part_content", "cur_content",
+        "_cur_subsection", "_part_prompt_view", "cur_subsection_first",
+        "cur_subsection_content", "cur_subsection_content_opinion",
+    )
 
-    is_subsection_last: bool = False
+    is_part_last: bool
 
-    is_report_last: bool = False
+    is_subsection_last: bool
 
-    all_parts_num: int = 0
+    is_report_last: bool
+
+    all_parts_num: int
 
     # 上一次章节
-    prev_part_num: int = 0
+    prev_part_num: int
 
     # 上一次章节
-    prev_part: Dict[str, Any] = {}
+    prev_part: Dict[str, Any]
 
     # 上一次章节的内容
-    prev_part_content: List[str] = []
+    prev_part_content: List[str]
 
-    prev_part_content_abstract: str = ""
+    prev_part_content_abstract: str
 
     # 上一次章节的子部分
-    prev_subsection: Dict[str, Any] = {}
+    prev_subsection: Dict[str, Any]
 
     # 上一次章节的子部分内容
-    prev_subsection_content: str = ""
+    prev_subsection_content: str
 
 
-    cur_part_num: int = 0
-    # 当前处理的部分
-    cur_part:Dict[str, Any] = {}
+    cur_part_num: int
+    # 当前处理的部分，通过 cur_part 属性读写
+    _cur_part:Dict[str, Any]
 
     # 当前处理的内容
-    cur_part_content: List[str] = []
+    cur_part_content: List[str]
+
+    cur_content: str
 
-    cur_content: str = ""
+    # 当前处理的子部分，通过 cur_subsection 属性读写
+    _cur_subsection:Dict[str, Any]
 
-    # 当前处理的子部分
-    cur_subsection:Dict[str, Any] = {}
+    # 由 cur_part / cur_subsection 派生的提示词字段，二者被重新赋值时失效
+    _part_prompt_view: Optional[Dict[str, Any]]
 
-    cur_subsection_first: bool = True
+    cur_subsection_first: bool
 
     # 当前处理的子部分内容
-    cur_subsection_content : str = ""
+    cur_subsection_content : str
 
     # 当前处理的内容
-    cur_subsection_content_opinion:  List[Dict[str, Any]] = []
+    cur_subsection_content_opinion:  List[Dict[str, Any]]
+
+    def __init__(self):
+        self.is_part_last = False
+        self.is_subsection_last = False
+        self.is_report_last = False
+        self.all_parts_num = 0
+        self.prev_part_num = 0
+        self.prev_part_content_abstract = ""
+        self.prev_subsection_content = ""
+        self.cur_part_num = 0
+        self.cur_content = ""
+        self._part_prompt_view = None
+        self.cur_subsection_first = True
+        self.cur_subsection_content = ""
+        # 可变容器在实例上创建，避免不同章节上下文共享同一个对象
+        self.prev_part = {}
+        self.prev_part_content = []
+        self.prev_subsection = {}
+        self._cur_part = {}
+        self.cur_part_content = []
+        self._cur_subsection = {}
+        self.cur_subsection_content_opinion = []
+
+    @property
+    def cur_part(self) -> Dict[str, Any]:
+        return self._cur_part
+
+    @cur_part.setter
+    def cur_part(self, value: Dict[str, Any]):
+        self._cur_part = value
+        self._part_prompt_view = None
+
+    @property
+    def cur_subsection(self) -> Dict[str, Any]:
+        return self._cur_subsection
+
+    @cur_subsection.setter
+    def cur_subsection(self, value: Dict[str, Any]):
+        self._cur_subsection = value
+        self._part_prompt_view = None
+
+    def get_part_prompt_view(self) -> Dict[str, Any]:
+        """当前章节大纲对应的提示词字段，章节未切换时直接复用"""
+        if self._part_prompt_view is None:
+            part = self._cur_part
+            part_title = part.get("part_title", "")
+            part_desc = part.get("part_desc", "")
+            part_content_type = part.get("part_content_type", "")
+            part_key_output = part.get("part_key_output", "")
+            part_data_source = part.get("part_data_source", "")
+            self._part_prompt_view = {
+                'part_title_name': self.get_part_title_name(),
+                'part_title': part_title,
+                'part_title_type': part.get("part_title_type", ""),
+                'part_desc': part_desc,
+                'part_content_type': part_content_type,
+                'part_key_output': part_key_output,
+                'part_data_source': part_data_source,
+                'part_importance': part.get("part_importance", ""),
+                'part_length_ratio': part.get("part_length_ratio", ""),
+
+                'cur_part_title': part_title,
+                'cur_part_central_idea': part.get("part_central_idea", ""),
+                'cur_part_desc': part_desc,
+                'cur_part_content_type': part_content_type,
+                'cur_part_key_output': part_key_output,
+                'cur_part_data_source': part_data_source,
+
+                'cur_subsection_title': self._cur_subsection.get("subsection_title", ""),
+                'cur_subsection_central_idea': part.get("subsection_central_idea", ""),
+                'cur_subsection_desc': part.get("subsection_desc", ""),
+            }
+        return self._part_prompt_view
 
     def get_part_title_name(self):
         part_title = self.get_cur_part_value("part_title")
@@ -109,8 +197,14 @@ class CurPart:
 
 class ReportContent:
 
-    report_title: str = ""
-    report_outline: List[Dict[str, Any]] = []
+    __slots__ = ("report_title", "report_outline")
+
+    report_title: str
+    report_outline: List[Dict[str, Any]]
+
+    def __init__(self):
+        self.report_title = ""
+        self.report_outline = []
 
     def get_content_list(self)->List[str]:
         return ContentConvert(self.report_outline).get_content_list()
@@ -494,54 +588,83 @@ class ReportInfo:
         2.8 投资建议（是否过于简单，是否缺乏具体的投资策略）
         2.9 风险提示（是否过于简单，是否缺乏具体的风险提示，是否风险评估过于定性）
     """
+    # 上面的提示词常量是类属性，实例属性统一列在 __slots__ 中，在 __init__ 里设置
+    __slots__ = (
+        "rag_context", "rag_company", "target_company", "part_rag_context", "report_title",
+        "_report_outline", "_outline_index", "report_outline_opinion", "cur_part_context",
+        "report_content", "generated_names", "report_text_list", "_report_is_sub_part",
+    )
+
     # 报告章节信息
     part_rag_context : Any
     # 报告题目
-    report_title: str = ""
-    # 报告大纲
-    report_outline : List[Any] = []
+    report_title: str
+    # 报告大纲，通过 report_outline 属性读写
+    _report_outline : List[Any]
+
+    # 由大纲派生的编号索引，大纲被重新赋值时失效
+    _outline_index: Optional[OutlineIndex]
 
     # 报告大纲修改意见
-    report_outline_opinion : List[Dict[str, Any]] = []
+    report_outline_opinion : List[Dict[str, Any]]
 
-    cur_part_context:CurPart = CurPart()
+    cur_part_context:CurPart
 
-    report_content: ReportContent = ReportContent()
+    report_content: ReportContent
 
-    generated_names = set()
+    generated_names: set
 
-    report_text_list=[]
+    report_text_list: List[str]
 
-    _report_is_sub_part = []
+    _report_is_sub_part: List[bool]
 
-    def has_sub_nodes(self) -> List[bool]:
-        """判断每个章节是否有子节点
+    @property
+    def report_outline(self) -> List[Any]:
+        return self._report_outline
 
-        Args:
-            parts: 包含章节信息的列表，每个元素包含part_num字段
+    @report_outline.setter
+    def report_outline(self, value: List[Any]):
+        self._report_outline = value
+        self._outline_index = None
 
-        Returns:
-            返回一个布尔列表，表示每个章节是否有子节点
-        """
-        result = []
-        part_nums = [part["part_num"] for part in self.report_outline]
+    @property
+    def outline_index(self) -> OutlineIndex:
+        """大纲编号索引，大纲未重新赋值时直接复用"""
+        if self._outline_index is None:
+            self._outline_index = OutlineIndex(self._report_outline)
+        return self._outline_index
 
-        for i, part in enumerate(self.report_outline):
-            current_num = part["part_num"]
-            # 检查是否是父节点（是否有以当前编号为前缀的其他编号）
-            is_parent = any(
-                other_num.startswith(current_num + ".")
-                for other_num in part_nums
-                if other_num != current_num
-            )
-            result.append(is_parent)
+    def has_sub_nodes(self) -> Tuple[bool, ...]:
+        """判断每个章节是否有子节点
 
-        return result
+        Returns:
+            返回一个只读的布尔元组，表示每个章节是否有子节点
+        """
+        return self.outline_index.is_parent
 
     def __init__(self,target_company,rag_context,rag_company):
         self.rag_context = rag_context
         self.rag_company = rag_company
         self.target_company = target_company
+        self.report_title = ""
+        self.part_rag_context = None
+        # 可变容器在实例上创建，避免多份报告之间共享大纲、正文和章节上下文
+        self._outline_index = None
+        self.report_outline = []
+        self.report_outline_opinion = []
+        self.cur_part_context = CurPart()
+        self.report_content = ReportContent()
+        self.generated_names = set()
+        self.report_text_list = []
+        self._report_is_sub_part = []
+
+    def fork_part(self, part: Dict[str, Any], is_report_last: bool) -> "ReportInfo":
+        """复制报告信息并使用独立的章节上下文，多个章节并发生成时互不干扰"""
+        part_info = copy.copy(self)
+        part_info.cur_part_context = CurPart()
+        part_info.cur_part_context.cur_part = part
+        part_info.cur_part_context.is_report_last = is_report_last
+        return part_info
 
     def map_dict_to_cur_part(self) -> {}:
         """
@@ -572,67 +695,25 @@ class ReportInfo:
     # - part_key_output: 本部分需产出的关键结论或成果（例如：明确研究对象的核心定义、研究范围及研究必要性）
     # - part_data_source: 支撑该部分内容的典型数据 / 资料来源（例如：行业词典、政策文件、经典文献等）
     def get_user_prompt_part_input(self):
-
-        part_title_name = self.cur_part_context.get_part_title_name()
-        part_title = self.cur_part_context.get_cur_part_value("part_title")
-        part_title_type = self.cur_part_context.get_cur_part_value("part_title_type")
-        part_desc = self.cur_part_context.get_cur_part_value("part_desc")
-        part_content_type = self.cur_part_context.get_cur_part_value("part_content_type")
-        part_key_output = self.cur_part_context.get_cur_part_value("part_key_output")
-        part_data_source = self.cur_part_context.get_cur_part_value("part_data_source")
-        part_importance = self.cur_part_context.get_cur_part_value("part_importance")
-        part_length_ratio = self.cur_part_context.get_cur_part_value("part_length_ratio")
-        cur_content =self.cur_part_context.cur_content
-
-        cur_part_title = self.cur_part_context.get_cur_part_value("part_title")
-        cur_part_desc = self.cur_part_context.get_cur_part_value("part_desc")
-        cur_part_central_idea  = self.cur_part_context.get_cur_part_value("part_central_idea")
-        cur_part_content_type =  self.cur_part_context.get_cur_part_value("part_content_type")
-        cur_part_key_output =  self.cur_part_context.get_cur_part_value("part_key_output")
-        cur_part_data_source =  self.cur_part_context.get_cur_part_value("part_data_source")
-
-        cur_subsection_title = self.cur_part_context.get_cur_subsection_value("subsection_title")
-        cur_subsection_central_idea = self.cur_part_context.get_cur_part_value("subsection_central_idea")
-        cur_subsection_desc = self.cur_part_context.get_cur_part_value("subsection_desc")
-        prev_part_content_abstract = self.cur_part_context.get_prev_content_prompt()
+        cur_part_context = self.cur_part_context
         return {
-            'part_title_name' :part_title_name,
-            'part_title':  part_title,
-            'part_title_type':  part_title_type,
-            'part_desc':  part_desc,
-            'part_content_type':part_content_type,
-            'part_key_output':part_key_output,
-            'part_data_source':part_data_source,
-            'part_importance':part_importance,
-            'part_length_ratio':part_length_ratio,
-            'cur_content':cur_content,
-
-            'prev_part_content':self.cur_part_context.prev_part_content,
+            **cur_part_context.get_part_prompt_view(),
+            'cur_content': cur_part_context.cur_content,
+
+            'prev_part_content': cur_part_context.prev_part_content,
             'report_data': self.rag_context,
             'rag_company': self.rag_company,
-            'cur_part_content': self.cur_part_context.cur_part_content,
+            'cur_part_content': cur_part_context.cur_part_content,
 
-            'target_company':self.target_company,
+            'target_company': self.target_company,
             'report_outline': self.report_outline,
 
             'report_title': self.report_title,
 
-            'cur_part_title': cur_part_title,
-            'cur_part_central_idea': cur_part_central_idea,
-            'cur_part_desc': cur_part_desc,
-            'cur_part_content_type':cur_part_content_type,
-            'cur_part_key_output':cur_part_key_output,
-            'cur_part_data_source':cur_part_data_source,
-
-
-            'cur_subsection_title': cur_subsection_title,
-            'cur_subsection_central_idea': cur_subsection_central_idea,
-            'cur_subsection_desc': cur_subsection_desc,
-            'cur_subsection_content': self.cur_part_context.cur_subsection_content,
-            'cur_subsection_content_opinion': self.cur_part_context.cur_subsection_content_opinion,
-            'part_content_opinion': self.cur_part_context.cur_subsection_content_opinion,
-            'prev_part_content_abstract': prev_part_content_abstract,
-
+            'cur_subsection_content': cur_part_context.cur_subsection_content,
+            'cur_subsection_content_opinion': cur_part_context.cur_subsection_content_opinion,
+            'part_content_opinion': cur_part_context.cur_subsection_content_opinion,
+            'prev_part_content_abstract': cur_part_context.get_prev_content_prompt(),
         }
 
     def create_report_content(self):
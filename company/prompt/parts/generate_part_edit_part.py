@@ -1,3 +1,5 @@
+import textwrap
+
 # 一个专业的[角色定义]
 # 核心能力
 # - 能力1
@@ -167,6 +169,14 @@ USER_PROMPT_PART_EDIT_MODIFY_PART = f"""
 【财务研报汇总内容结束】
 """
 
+# 最后一个章节末尾需要列出的引用文献
+FINAL_SECTION_REFERENCES_SUFFIX = textwrap.dedent("""
+    请在本节最后以"##  引用文献"格式，列出所有正文中用到的参考资料，格式如下：
+    [1] 东方财富-港股-财务报表: https://emweb.securities.eastmoney.com/PC_HKF10/FinancialAnalysis/index
+    [2] 同花顺-主营介绍: https://basic.10jqka.com.cn/new/000066/operate.html
+    [3] 同花顺-股东信息: https://basic.10jqka.com.cn/HK0020/holder.html
+    """)
+
 # ### 公司基础信息
 # - 公司全称：[请填写]
 # - 股票代码：[请填写]
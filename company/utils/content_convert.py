@@ -3,8 +3,28 @@
 
 
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
+# 锚点与标题清理用到的正则，模块加载时编译一次
+_DROP_DOTS = str.maketrans('', '', '.')
+# 空白、连字符及其他特殊字符组成的连续片段，整体替换为一个连字符
+_NON_ANCHOR_RE = re.compile(r'[^a-z0-9\u4e00-\u9fff]+')
+_TRAILING_DOT_RE = re.compile(r'(\d+)\.\s*')
+
+# 目录中各级标题的缩进前缀
+_TOC_PREFIXES = {'章': "- ", '节': "  - ", '小节': "   - "}
+
+
+@lru_cache(maxsize=1024)
+def _anchor_for(text: str) -> str:
+    """按标题文本缓存锚点，同一份大纲的目录会被多次生成"""
+    # 转换为小写并移除点号
+    anchor = text.lower().translate(_DROP_DOTS)
+    # 空格、特殊字符转为连字符，并合并多个连字符，一次扫描完成
+    anchor = _NON_ANCHOR_RE.sub('-', anchor)
+    return anchor.strip('-')
+
 
 class ContentConvert:
     """内容转换器，用于生成目录结构"""
@@ -28,25 +48,20 @@ class ContentConvert:
 
     def get_content_list_1(self) -> List[str]:
         content_lines = ["## 目录\n"]
+        append = content_lines.append
         for idx, part in enumerate(self.parts):
+            part_title_type = part.get('part_title_type')
+            prefix = _TOC_PREFIXES.get(part_title_type)
+            if prefix is None:
+                continue
+
             part_title = part.get('part_title', f'部分{idx + 1}')
-                
-            part_title_type = part.get('part_title_type', f'部分{idx + 1}')
             if part_title_type == '章':
                 part_title = self._clean_trailing_dot(part_title)
-                # 使用 _create_anchor 方法生成正确的锚点
-                anchor = self._create_anchor(part_title)
-                content_lines.append(f"- [{part_title}](#{anchor})")
-            elif part_title_type == '节':
-                anchor = self._create_anchor(part_title)
-                content_lines.append(f"  - [{part_title}](#{anchor})")
-            elif part_title_type == '小节':
-                anchor = self._create_anchor(part_title)
-                content_lines.append(f"   - [{part_title}](#{anchor})")
+            append(f"{prefix}[{part_title}](#{_anchor_for(part_title)})")
         
         # 引用文献的锚点也需要正确格式化
-        ref_anchor = self._create_anchor("引用文献")
-        content_lines.append(f"- [引用文献](#{ref_anchor})")
+        append(f"- [引用文献](#{_anchor_for('引用文献')})")
     
         return content_lines
     
@@ -62,7 +77,7 @@ class ContentConvert:
         """
         # 使用正则表达式匹配数字后面的点号并移除
         # 匹配模式：数字 + 点号 + 可能的空格 + 其他内容
-        cleaned_title = re.sub(r'(\d+)\.\s*', r'\1 ', title)
+        cleaned_title = _TRAILING_DOT_RE.sub(r'\1 ', title)
         return cleaned_title.strip()
 
     def get_content_list(self) -> List[str]:
@@ -73,6 +88,7 @@ class ContentConvert:
             List[str]: 格式化的目录字符串列表
         """
         content_lines = ["## 目录\n"]
+        append = content_lines.append
 
         for idx, part in enumerate(self.parts):
             if not isinstance(part, dict):
@@ -82,14 +98,12 @@ class ContentConvert:
             part_num = part.get('part_num', f'部分{idx + 1}')
 
             # 生成锚点链接
-            anchor = self._create_anchor(f"{part_num}-{part_title}")
-            content_lines.append(f"- [{part_title}](#{anchor})")
+            append(f"- [{part_title}](#{_anchor_for(f'{part_num}-{part_title}')})")
 
             # 处理子章节
             subsections = part.get('subsections', [])
             if isinstance(subsections, list) and subsections:
-                subsection_lines = self._process_subsections(subsections)
-                content_lines.extend(subsection_lines)
+                content_lines.extend(self._process_subsections(subsections))
 
         return content_lines
     
@@ -104,6 +118,7 @@ class ContentConvert:
             List[str]: 格式化的子章节字符串列表
         """
         subsection_lines = []
+        append = subsection_lines.append
         
         for idx, subsection in enumerate(subsections):
             if not isinstance(subsection, dict):
@@ -113,8 +128,7 @@ class ContentConvert:
             subsection_num = subsection.get('subsection_num', f'子章节{idx + 1}')
             
             # 生成锚点链接
-            anchor = self._create_anchor(f"{subsection_num}-{subsection_title}")
-            subsection_lines.append(f"  - [{subsection_title}](#{anchor})")
+            append(f"  - [{subsection_title}](#{_anchor_for(f'{subsection_num}-{subsection_title}')})")
         
         return subsection_lines
     
@@ -128,14 +142,7 @@ class ContentConvert:
         Returns:
             str: 处理后的锚点文本
         """
-        # 转换为小写
-        anchor = text.lower()
-        # 移除点号，保留空格暂时作为分隔符
-        anchor = re.sub(r'\.', '', anchor)  # 移除点号
-        anchor = re.sub(r'\s+', '-', anchor)  # 空格转为连字符
-        anchor = re.sub(r'[^a-z0-9\u4e00-\u9fff\-]', '-', anchor)  # 其他特殊字符转连字符
-        anchor = re.sub(r'-+', '-', anchor)  # 合并多个连字符
-        return anchor.strip('-')
+        return _anchor_for(text)
     
     def validate_structure(self) -> bool:
         """
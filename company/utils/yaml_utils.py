@@ -0,0 +1,35 @@
+"""
+LLM 输出中 YAML 内容的提取与解析
+"""
+import re
+from typing import Any
+
+import yaml
+
+# 优先使用 libyaml 实现的 C 解析器
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# 兼容 ```yaml / ```yml / ```YAML 等围栏写法，缺少结束围栏时取到文本末尾
+_YAML_FENCE_RE = re.compile(r"```ya?ml\s*(.*?)(?:```|\Z)", re.I | re.S)
+
+
+def extract_yaml_block(text: str) -> str:
+    """提取 yaml 代码块中的内容，没有代码块时返回原文"""
+    match = _YAML_FENCE_RE.search(text)
+    return match.group(1) if match else text
+
+
+# 只在开头这一段内查找 YAML 键值分隔符，判断输出是否为纯文本
+_YAML_PROBE_SIZE = 4096
+
+
+def load_yaml(text: str) -> Any:
+    """提取并解析 LLM 输出中的 YAML，输出不含键值结构时直接返回空列表"""
+    yaml_block = extract_yaml_block(text)
+    # 纯文本输出不必交给解析器逐字符扫描
+    if ":" not in yaml_block[:_YAML_PROBE_SIZE]:
+        return []
+    return yaml.load(yaml_block, Loader=_SafeLoader)
@@ -4,55 +4,77 @@
 """
 
 import os
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping
 from dotenv import load_dotenv
 
 # 确保在配置加载前加载环境变量，强制覆盖已存在的环境变量
 load_dotenv(override=True)
 
+# 各配置项：(配置键, 环境变量名, 默认值, 类型转换)
+_POSTGRES_SCHEMA = (
+    ('host', 'POSTGRES_HOST', 'localhost', str),
+    ('port', 'POSTGRES_PORT', '5432', str),
+    ('database', 'POSTGRES_DB', 'rag_knowledge', str),
+    ('user', 'POSTGRES_USER', 'postgres', str),
+    ('password', 'POSTGRES_PASSWORD', 'password', str),
+    ('sslmode', 'POSTGRES_SSLMODE', 'prefer', str),
+)
+
+_RAG_SCHEMA = (
+    ('model_name', 'RAG_MODEL_NAME', 'all-MiniLM-L6-v2', str),
+    ('vector_dim', 'RAG_VECTOR_DIM', '384', int),
+    ('chunk_size', 'RAG_CHUNK_SIZE', '500', int),
+    ('chunk_overlap', 'RAG_CHUNK_OVERLAP', '50', int),
+    ('max_tokens', 'RAG_MAX_TOKENS', '4000', int),
+    ('top_k', 'RAG_TOP_K', '10', int),
+)
+
+_POOL_SCHEMA = (
+    ('min_connections', 'DB_MIN_CONNECTIONS', '1', int),
+    ('max_connections', 'DB_MAX_CONNECTIONS', '10', int),
+    ('connection_timeout', 'DB_CONNECTION_TIMEOUT', '30', int),
+)
+
+
+def _read_config(env, schema) -> Dict[str, Any]:
+    """按配置表从环境变量读取一组配置"""
+    return {key: cast(env.get(name, default)) for key, name, default, cast in schema}
+
+
 class DatabaseConfig:
     """数据库配置类"""
     
     def __init__(self):
+        env = os.environ
+
         # PostgreSQL配置
-        self.postgres_config = {
-            'host': os.getenv('POSTGRES_HOST', 'localhost'),
-            'port': os.getenv('POSTGRES_PORT', '5432'),
-            'database': os.getenv('POSTGRES_DB', 'rag_knowledge'),
-            'user': os.getenv('POSTGRES_USER', 'postgres'),
-            'password': os.getenv('POSTGRES_PASSWORD', 'password'),
-            'sslmode': os.getenv('POSTGRES_SSLMODE', 'prefer')
-        }
+        self.postgres_config = _read_config(env, _POSTGRES_SCHEMA)
         
         # RAG配置 - 使用通用的句子嵌入模型
-        self.rag_config = {
-            'model_name': os.getenv('RAG_MODEL_NAME', 'all-MiniLM-L6-v2'),
-            'vector_dim': int(os.getenv('RAG_VECTOR_DIM', '384')),
-            'chunk_size': int(os.getenv('RAG_CHUNK_SIZE', '500')),
-            'chunk_overlap': int(os.getenv('RAG_CHUNK_OVERLAP', '50')),
-            'max_tokens': int(os.getenv('RAG_MAX_TOKENS', '4000')),
-            'top_k': int(os.getenv('RAG_TOP_K', '10')),
-            'device': os.getenv('RAG_DEVICE', 'cuda' if os.getenv('USE_GPU', 'true').lower() == 'true' else 'cpu')
-        }
+        self.rag_config = _read_config(env, _RAG_SCHEMA)
+        default_device = 'cuda' if env.get('USE_GPU', 'true').lower() == 'true' else 'cpu'
+        self.rag_config['device'] = env.get('RAG_DEVICE', default_device)
         
         # 连接池配置
-        self.pool_config = {
-            'min_connections': int(os.getenv('DB_MIN_CONNECTIONS', '1')),
-            'max_connections': int(os.getenv('DB_MAX_CONNECTIONS', '10')),
-            'connection_timeout': int(os.getenv('DB_CONNECTION_TIMEOUT', '30'))
-        }
+        self.pool_config = _read_config(env, _POOL_SCHEMA)
+
+        # 对外只读视图，调用方读取配置时无需每次复制字典
+        self._postgres_view = MappingProxyType(self.postgres_config)
+        self._rag_view = MappingProxyType(self.rag_config)
+        self._pool_view = MappingProxyType(self.pool_config)
     
-    def get_postgres_config(self) -> Dict[str, str]:
-        """获取PostgreSQL配置"""
-        return self.postgres_config.copy()
+    def get_postgres_config(self) -> Mapping[str, str]:
+        """获取PostgreSQL配置（只读，需要修改时请先 dict(...) 复制）"""
+        return self._postgres_view
     
-    def get_rag_config(self) -> Dict[str, Any]:
-        """获取RAG配置"""
-        return self.rag_config.copy()
+    def get_rag_config(self) -> Mapping[str, Any]:
+        """获取RAG配置（只读，需要修改时请先 dict(...) 复制）"""
+        return self._rag_view
     
-    def get_pool_config(self) -> Dict[str, int]:
-        """获取连接池配置"""
-        return self.pool_config.copy()
+    def get_pool_config(self) -> Mapping[str, int]:
+        """获取连接池配置（只读，需要修改时请先 dict(...) 复制）"""
+        return self._pool_view
     
     def validate_config(self) -> bool:
         """验证配置是否有效"""
@@ -88,4 +110,4 @@ class DatabaseConfig:
         print(f"连接超时: {self.pool_config['connection_timeout']}秒")
 
 # 全局配置实例
-db_config = DatabaseConfig() 
\ No newline at end of file
+db_config = DatabaseConfig()
@@ -83,13 +83,12 @@ def generate_outline(llm, background, report_content):
         parts = []
     return parts
 
-def generate_section(llm, part_title, prev_content, background, report_content, is_last, generated_names=None):
-    if generated_names is None:
-        generated_names = []
+def generate_section(llm, part_title, prev_content, background, report_content, is_last, generated_names=""):
+    """generated_names 为已生成章节名用顿号拼接的字符串"""
     section_prompt = f"""
 你是一位顶级金融分析师和研报撰写专家。请基于以下内容，直接输出\"{part_title}\"这一部分的完整研报内容。
 
-【已生成章节】：{list(generated_names)}
+【已生成章节】：{generated_names}
 
 **重要要求：**
 1. 直接输出完整可用的研报内容，以\"## {part_title}\"开头
@@ -325,21 +324,24 @@ def main():
     full_report = [f'# {args.company}公司研报\n']
     prev_content = ''
     generated_names = set()
+    generated_names_str = ""
     for idx, part in enumerate(parts):
         part_title = part.get('part_title', f'部分{idx+1}')
         if part_title in generated_names:
             logger.warning(f"章节 {part_title} 已生成，跳过")
-            logger.info(f"同步给LLM：已生成章节 {list(generated_names)}，跳过 {part_title}")
+            logger.info(f"同步给LLM：已生成章节 {generated_names_str}，跳过 {part_title}")
             continue
         logger.info(f"\n  正在生成：{part_title}")
         is_last = (idx == len(parts) - 1)
         section_text = generate_section(
-            llm, part_title, prev_content, background, report_content, is_last, list(generated_names)
+            llm, part_title, prev_content, background, report_content, is_last, generated_names_str
         )
         full_report.append(section_text)
         logger.info(f"  ✅ 已完成：{part_title}")
         prev_content = '\n'.join(full_report)
         generated_names.add(part_title)
+        # 已生成章节名只在新增章节时重新拼接，跳过和生成时直接复用
+        generated_names_str = "、".join(generated_names)
     
     final_report = '\n\n'.join(full_report)
     output_file = f"{args.output_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
@@ -6,6 +6,7 @@
 """
 
 import os
+import asyncio
 import glob
 import time
 import json
@@ -16,7 +17,6 @@ import requests
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
-import importlib
 from urllib.parse import urlparse
 
 from data_analysis_agent import quick_analysis
@@ -26,7 +26,6 @@ from utils.get_shareholder_info import get_shareholder_info, get_table_content
 from utils.get_financial_statements import get_all_financial_statements, save_financial_statements_to_csv
 from utils.identify_competitors import identify_competitors_with_ai
 from utils.get_stock_intro import get_stock_intro, save_stock_intro_to_txt
-from duckduckgo_search import DDGS
 from utils.markdown_tools import convert_to_docx, format_markdown
 from utils.search_engine import SearchEngine
 
@@ -267,49 +266,48 @@ class IntegratedResearchReportGenerator:
         
         # 整理公司信息
         company_infos = self.get_company_infos(self.company_info_dir)
-        company_infos = self.llm.call(
-            f"请整理以下公司信息内容，确保格式清晰易读，并保留关键信息：\n{company_infos}",
-            system_prompt="你是一个专业的公司信息整理师。",
-            max_tokens=8192,
-            temperature=0.5
-        )
         
         # 整理股权信息
         info = get_shareholder_info()
         shangtang_shareholder_info = info.get("tables")
         table_content = get_table_content(shangtang_shareholder_info)
-        shareholder_analysis = self.llm.call(
-            "请分析以下股东信息表格内容：\n" + table_content,
-            system_prompt="你是一个专业的股东信息分析师。",
-            max_tokens=8192,
-            temperature=0.5
+        
+        # 两次 LLM 整理互不依赖，并发执行
+        company_infos, shareholder_analysis = asyncio.run(
+            self.summarize_infos_async(company_infos, table_content)
         )
         
         # 整理行业信息搜索结果
         with open(search_results_file, 'r', encoding='utf-8') as f:
             all_search_results = json.load(f)
-        search_res = ""
+        search_lines = []
         for company, results in all_search_results.items():
-            search_res += f"【{company}搜索信息开始】\n"
+            search_lines.append(f"【{company}搜索信息开始】\n")
             for result in results:
-                search_res += f"标题: {result.get('title', '无标题')}\n"
-                search_res += f"链接: {result.get('href', '无链接')}\n"
-                search_res += f"摘要: {result.get('body', '无摘要')}\n"
-                search_res += "----\n"
-            search_res += f"【{company}搜索信息结束】\n\n"
+                search_lines.append(
+                    f"标题: {result.get('title', '无标题')}\n"
+                    f"链接: {result.get('href', '无链接')}\n"
+                    f"摘要: {result.get('body', '无摘要')}\n"
+                    "----\n"
+                )
+            search_lines.append(f"【{company}搜索信息结束】\n\n")
+        search_res = "".join(search_lines)
         
         # 保存阶段一结果
         formatted_report = self.format_final_reports(merged_results)
         
         # 统一保存为markdown
         md_output_file = f"财务研报汇总_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        md_sections = [
+            f"# 公司基础信息\n\n## 整理后公司信息\n\n{company_infos}\n\n",
+            f"# 股权信息分析\n\n{shareholder_analysis}\n\n",
+            f"# 行业信息搜索结果\n\n{search_res}\n\n",
+            f"# 财务数据分析与两两对比\n\n{formatted_report}\n\n",
+        ]
+        if sensetime_valuation_report and isinstance(sensetime_valuation_report, dict):
+            md_sections.append(f"# 商汤科技估值与预测分析\n\n{sensetime_valuation_report.get('final_report', '未生成报告')}\n\n")
         with open(md_output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# 公司基础信息\n\n## 整理后公司信息\n\n{company_infos}\n\n")
-            f.write(f"# 股权信息分析\n\n{shareholder_analysis}\n\n")
-            f.write(f"# 行业信息搜索结果\n\n{search_res}\n\n")
-            f.write(f"# 财务数据分析与两两对比\n\n{formatted_report}\n\n")
-            if sensetime_valuation_report and isinstance(sensetime_valuation_report, dict):
-                f.write(f"# 商汤科技估值与预测分析\n\n{sensetime_valuation_report.get('final_report', '未生成报告')}\n\n")
+            f.write("".join(md_sections))
         
         self.logger.info(f"\n✅ 第一阶段完成！基础分析报告已保存到: {md_output_file}")
         
@@ -403,6 +401,23 @@ class IntegratedResearchReportGenerator:
 
     # ========== 辅助方法（从原始脚本移植） ==========
     
+    async def summarize_infos_async(self, company_infos, table_content):
+        """并发整理公司信息和分析股东信息"""
+        return await asyncio.gather(
+            self.llm.async_call(
+                f"请整理以下公司信息内容，确保格式清晰易读，并保留关键信息：\n{company_infos}",
+                system_prompt="你是一个专业的公司信息整理师。",
+                max_tokens=8192,
+                temperature=0.5
+            ),
+            self.llm.async_call(
+                "请分析以下股东信息表格内容：\n" + table_content,
+                system_prompt="你是一个专业的股东信息分析师。",
+                max_tokens=8192,
+                temperature=0.5
+            ),
+        )
+    
     def get_company_infos(self, data_dir="./company_info"):
         """获取公司信息"""
         all_files = os.listdir(data_dir)
@@ -23,6 +23,8 @@ class LLMConfig:
     model: str = os.environ.get("OPENAI_MODEL", "gpt-4-turbo-preview")
     temperature: float = 0.1
     max_tokens: int = 8192
+    # 拼入提示词的检索内容最多保留的 token 数
+    context_max_tokens: int = 4000
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
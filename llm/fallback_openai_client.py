@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import weakref
 from typing import Optional, Any, Mapping, Dict
 from openai import AsyncOpenAI, APIStatusError, APIConnectionError, APITimeoutError, APIError
 from openai.types.chat import ChatCompletion
@@ -46,15 +47,16 @@ class AsyncFallbackOpenAIClient:
         if not primary_api_key or not primary_base_url:
             raise ValueError("主 API 密钥和基础 URL 不能为空。")
 
-        _primary_args = primary_client_args or {}
-        self.primary_client = AsyncOpenAI(api_key=primary_api_key, base_url=primary_base_url, **_primary_args)
+        self._primary_args = {"api_key": primary_api_key, "base_url": primary_base_url, **(primary_client_args or {})}
+        self._primary_client = AsyncOpenAI(**self._primary_args)
         self.primary_model_name = primary_model_name
 
-        self.fallback_client: Optional[AsyncOpenAI] = None
+        self._fallback_args: Optional[Dict[str, Any]] = None
+        self._fallback_client: Optional[AsyncOpenAI] = None
         self.fallback_model_name: Optional[str] = None
         if fallback_api_key and fallback_base_url and fallback_model_name:
-            _fallback_args = fallback_client_args or {}
-            self.fallback_client = AsyncOpenAI(api_key=fallback_api_key, base_url=fallback_base_url, **_fallback_args)
+            self._fallback_args = {"api_key": fallback_api_key, "base_url": fallback_base_url, **(fallback_client_args or {})}
+            self._fallback_client = AsyncOpenAI(**self._fallback_args)
             self.fallback_model_name = fallback_model_name
         else:
             print("⚠️ 警告: 未完全配置备用 API 客户端。如果主 API 失败，将无法进行回退。")
@@ -65,6 +67,34 @@ class AsyncFallbackOpenAIClient:
         self.max_retries_fallback = max_retries_fallback
         self.retry_delay_seconds = retry_delay_seconds
         self._closed = False
+        # AsyncOpenAI 的连接池绑定到首次使用它的事件循环，记录该循环，换了循环（如再次 asyncio.run）时重新创建客户端
+        self._client_loop: Optional[weakref.ref] = None
+
+    def _bind_event_loop(self) -> None:
+        """确保主/备用客户端属于当前运行中的事件循环"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        bound_loop = self._client_loop() if self._client_loop is not None else None
+        if bound_loop is loop:
+            return
+        if self._client_loop is not None:
+            # 旧客户端的连接属于已结束的事件循环，无法复用，也无法在新循环中关闭
+            self._primary_client = AsyncOpenAI(**self._primary_args)
+            if self._fallback_args is not None:
+                self._fallback_client = AsyncOpenAI(**self._fallback_args)
+        self._client_loop = weakref.ref(loop)
+
+    @property
+    def primary_client(self) -> AsyncOpenAI:
+        self._bind_event_loop()
+        return self._primary_client
+
+    @property
+    def fallback_client(self) -> Optional[AsyncOpenAI]:
+        self._bind_event_loop()
+        return self._fallback_client
 
     async def _attempt_api_call(
         self,
@@ -217,9 +247,9 @@ class AsyncFallbackOpenAIClient:
     async def close(self):
         """异步关闭主客户端和备用客户端 (如果存在)。"""
         if not self._closed:
-            await self.primary_client.close()
-            if self.fallback_client:
-                await self.fallback_client.close()
+            await self._primary_client.close()
+            if self._fallback_client:
+                await self._fallback_client.close()
             self._closed = True
             # print("AsyncFallbackOpenAIClient 已关闭。")
 
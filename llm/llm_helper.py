@@ -4,14 +4,24 @@ LLM调用辅助模块
 """
 
 import asyncio
+import re
 import yaml
 import os
 import datetime
-from typing import Optional, Any, Mapping, Dict
+from typing import Optional, Any, AsyncIterator, Mapping, Dict
 
 from .config import LLMConfig
 from .fallback_openai_client import AsyncFallbackOpenAIClient
 
+# 优先使用 libyaml 实现的 C 解析器
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# 已经闭合的 yaml 代码块，流式输出中出现后即可停止接收
+_CLOSED_YAML_FENCE_RE = re.compile(r"```ya?ml\s.*?```", re.I | re.S)
+
 class LLMHelper:
     """LLM调用辅助类，支持同步和异步调用"""
     
@@ -40,8 +50,9 @@ class LLMHelper:
     async def async_ask(self,
                         messages: list[Mapping[str, Any]],
                         max_tokens: int = None,
-                        temperature: float = None) -> str:
-        """异步调用LLM"""
+                        temperature: float = None,
+                        stop_at_yaml_end: bool = False) -> str:
+        """异步调用LLM，stop_at_yaml_end 为 True 时流式接收并在 yaml 代码块闭合后提前结束"""
         # messages = []
         # if system_prompt:
         #     messages.append({"role": "system", "content": system_prompt})
@@ -59,6 +70,8 @@ class LLMHelper:
             kwargs['temperature'] = self.config.temperature
 
         try:
+            if stop_at_yaml_end:
+                return await self._stream_until_yaml_end(messages, **kwargs)
             response = await self.client.chat_completions_create(
                 messages=messages,
                 **kwargs
@@ -70,7 +83,49 @@ class LLMHelper:
             print(f"LLM调用失败: {e}")
             return ""
 
-    def ask(self,  messages: list[Mapping[str, Any]], max_tokens: int = None, temperature: float = None) -> str:
+    async def astream(self,
+                      messages: list[Mapping[str, Any]],
+                      max_tokens: int = None,
+                      temperature: float = None) -> AsyncIterator[str]:
+        """流式调用LLM，按到达顺序逐段产出响应文本"""
+        stream = await self.client.chat_completions_create(
+            messages=messages,
+            stream=True,
+            max_tokens=max_tokens if max_tokens is not None else self.config.max_tokens,
+            temperature=temperature if temperature is not None else self.config.temperature
+        )
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        finally:
+            await stream.close()
+
+    async def _stream_until_yaml_end(self,
+                                     messages: list[Mapping[str, Any]],
+                                     max_tokens: int = None,
+                                     temperature: float = None) -> str:
+        """流式接收响应，yaml 代码块闭合后关闭连接，不再等待其后的说明文字"""
+        chunks = []
+        stream = self.astream(messages, max_tokens, temperature)
+        try:
+            async for delta in stream:
+                chunks.append(delta)
+                # 只有收到反引号时才可能出现闭合围栏
+                if "`" in delta and _CLOSED_YAML_FENCE_RE.search("".join(chunks)):
+                    break
+        finally:
+            await stream.aclose()
+        return "".join(chunks)
+
+    def ask(self,
+            messages: list[Mapping[str, Any]],
+            max_tokens: int = None,
+            temperature: float = None,
+            stop_at_yaml_end: bool = False) -> str:
         """同步调用LLM"""
         try:
             # 检查是否有运行中的事件循环
@@ -80,7 +135,7 @@ class LLMHelper:
                 try:
                     import nest_asyncio
                     nest_asyncio.apply()
-                    result = asyncio.run(self.async_ask(messages, max_tokens, temperature))
+                    result = asyncio.run(self.async_ask(messages, max_tokens, temperature, stop_at_yaml_end))
                 except ImportError:
                     # 如果没有nest_asyncio，使用线程方式
                     import concurrent.futures
@@ -95,7 +150,7 @@ class LLMHelper:
                             new_loop = asyncio.new_event_loop()
                             asyncio.set_event_loop(new_loop)
                             result = new_loop.run_until_complete(
-                                self.async_ask(messages, max_tokens, temperature))
+                                self.async_ask(messages, max_tokens, temperature, stop_at_yaml_end))
                             new_loop.close()
                         except Exception as e:
                             exception = e
@@ -108,7 +163,7 @@ class LLMHelper:
                         raise exception
             except RuntimeError:
                 # 没有运行中的事件循环，直接使用asyncio.run
-                result = asyncio.run(self.async_ask(messages, max_tokens, temperature))
+                result = asyncio.run(self.async_ask(messages, max_tokens, temperature, stop_at_yaml_end))
             
             return result
         except Exception as e:
@@ -204,7 +259,7 @@ class LLMHelper:
             else:
                 yaml_content = response.strip()
             
-            return yaml.safe_load(yaml_content)
+            return yaml.load(yaml_content, Loader=_SafeLoader)
         except Exception as e:
             print(f"YAML解析失败: {e}")
             print(f"原始响应: {response}")
@@ -4,6 +4,7 @@
 研报生成流程
 基于PostgreSQL数据库中的数据，生成深度研报并输出为markdown格式
 """
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -14,6 +15,7 @@ from dotenv import load_dotenv
 
 
 from company.agent.agent_factory import OutlineAgentFactory, OutlineAgentType
+from company.agent.llm_cache import get_response_cache
 from company.model.report_info import ReportInfo
 
 from company.utils.content_convert import ContentConvert
@@ -39,6 +41,18 @@ class ReportGenerationConfig:
         self.data_dir = Path("./download_financial_statement_files")
         self.logs_dir = Path("logs")
         self.max_discuss_rounds = int(os.getenv("MAX_DISCUSS_ROUNDS", "1"))
+        # 并发生成的章节数上限，避免超出接口限流
+        self.section_concurrency = int(os.getenv("SECTION_CONCURRENCY", "4"))
+        # 拼入提示词的检索内容最多保留的 token 数，需给提示词其余部分和输出留出上下文窗口
+        self.context_max_tokens = int(os.getenv("CONTEXT_MAX_TOKENS", "4000"))
+        # 完整提示词以 DEBUG 级别输出，调试时设置 LOG_LEVEL=DEBUG 查看
+        log_level = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+        # 无法识别的日志级别回退为 INFO，日志初始化后再给出提示（getLevelName 对已知级别名返回整数，兼容 3.8）
+        self.invalid_log_level: Optional[str] = None
+        if not isinstance(logging.getLevelName(log_level), int):
+            self.invalid_log_level = log_level
+            log_level = "INFO"
+        self.log_level = log_level
 
     def validate(self) -> bool:
         """验证配置是否有效"""
@@ -107,7 +121,7 @@ class ReportGenerationPipeline:
         log_filename = self.config.logs_dir / f"report_generation_{timestamp}.log"
 
         self._logger = logging.getLogger(f'ReportGeneration_{id(self)}')
-        self._logger.setLevel(logging.INFO)
+        self._logger.setLevel(self.config.log_level)
         self._logger.handlers.clear()
 
         # 文件处理器
@@ -123,6 +137,8 @@ class ReportGenerationPipeline:
         self._logger.addHandler(file_handler)
         self._logger.addHandler(console_handler)
         self._logger.info(f"📝 日志记录已启动，日志文件: {log_filename}")
+        if self.config.invalid_log_level is not None:
+            self._logger.warning("LOG_LEVEL=%s 无效，已使用 INFO", self.config.invalid_log_level)
 
     def _setup_llm(self) -> None:
         """初始化LLM配置"""
@@ -133,6 +149,7 @@ class ReportGenerationPipeline:
                 model=self.config.model,
                 temperature=self.config.temperature,
                 max_tokens=self.config.max_tokens,
+                context_max_tokens=self.config.context_max_tokens,
             )
             self._llm = LLMHelper(llm_config)
             self.logger.info(f"🔧 LLM初始化成功，使用模型: {self.config.model}")
@@ -451,39 +468,57 @@ class ReportGenerationPipeline:
         outline = report_info.report_outline
         self.logger.info("\n✍️ 开始分段生成深度研报...")
         report_content = []
-        part_all_num = len(outline)
-        generated_names = set()
         nodes = self.report_info.has_sub_nodes()
+        # 各章节的提示词互不依赖，先为每个章节准备独立的上下文，再统一并发生成
+        pending_parts = []
         for idx, part in enumerate(outline):
-            node = nodes[idx]
-
-            self.report_info.cur_part_context.cur_part = part
-            self.report_info.cur_part_context.is_report_last = (idx == len(outline) - 1)
+            part_info = report_info.fork_part(part, idx == len(outline) - 1)
             part_title = part.get('part_title', f'部分{idx + 1}')
 
-            if node:
-                part_title_name = self.report_info.cur_part_context.get_part_title_name()
+            if nodes[idx]:
+                part_title_name = part_info.cur_part_context.get_part_title_name()
                 report_content.append(f"{part_title_name}")
             else:
-                self.report_info.part_rag_context = self.rag_helper.get_context_for_llm(
+                part_info.part_rag_context = self.rag_helper.get_context_for_llm(
                     f"{part_title} {self.report_info.target_company}",
                     max_tokens=4000, top_k=10
                 )
-                discuss_count = 0
-                cur_content = ""
-                while discuss_count < 2:
-                    opinion = self._agents['section_opinion'].generate(self.report_info)
-                    report_info.cur_part_context.cur_subsection_content_opinion = opinion
-                    cur_content = self._agents['section_edit'].generate(report_info)
-                    discuss_count += 1
+                report_content.append("")
+                pending_parts.append((idx, part_info))
 
-                report_content.append(cur_content)
-            self.logger.info(f"✅ 已完成：{report_content}")
-            report_info.cur_part_context.cur_content = ""
-            generated_names.add(part_title)
-            self.logger.info(f"✅ 已完成：{part_title}")
+        contents = asyncio.run(self._generate_parts_async([part_info for _, part_info in pending_parts]))
+        for (idx, _), content in zip(pending_parts, contents):
+            report_content[idx] = content
+        self.logger.info("✅ 已完成：%s", report_content)
         return report_content
 
+    async def _generate_parts_async(self, part_infos: List[ReportInfo]) -> List[str]:
+        """并发生成多个章节正文，同时进行的章节数不超过 section_concurrency"""
+        semaphore = asyncio.Semaphore(self.config.section_concurrency)
+
+        async def generate_with_limit(part_info: ReportInfo) -> str:
+            async with semaphore:
+                return await self._generate_part_async(part_info)
+
+        return await asyncio.gather(*(generate_with_limit(part_info) for part_info in part_infos))
+
+    async def _generate_part_async(self, part_info: ReportInfo) -> str:
+        """生成单个章节正文，并根据评审意见修改"""
+        discuss_count = 0
+        cur_content = ""
+        while discuss_count < 2:
+            opinion = await self._agents['section_opinion'].generate_async(part_info)
+            if opinion is None:
+                # 评审认为当前正文无需修改，保留已生成内容
+                break
+            part_info.cur_part_context.cur_subsection_content_opinion = opinion
+            cur_content = await self._agents['section_edit'].generate_async(part_info)
+            discuss_count += 1
+
+        part_title = part_info.cur_part_context.get_cur_part_value('part_title')
+        self.logger.info("✅ 已完成：%s", part_title)
+        return cur_content
+
     def _load_abstract_template(self, template_name: str = "default") -> str:
 
         return ""
@@ -564,6 +599,8 @@ class ReportGenerationPipeline:
 
 
             self.logger.info(f"\n✅ 研报生成完成！文件已保存到: {output_file}")
+            cache = get_response_cache()
+            self.logger.info("📋 LLM 响应缓存命中 %d 次，未命中 %d 次", cache.hits, cache.misses)
             return output_file
 
         except Exception as e:
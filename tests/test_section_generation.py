@@ -0,0 +1,108 @@
+"""
+章节并发生成测试：使用桩 LLM，验证各章节上下文互不干扰、结果按大纲顺序返回
+"""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+from company.agent.parts.part_generator_part import PartGeneratorPart
+from company.agent.parts.part_opinion_generator_part import PartOpinionGeneratorPart
+from company.model.report_info import ReportInfo
+from company.prompt.parts.generate_part_edit_opinion_part import SYSTEM_PROMPT_PART_EDIT_OPINION_PART
+from run_company_research_report import ReportGenerationPipeline
+
+OUTLINE = [
+    {"part_num": "1", "part_title": "1. 公司概况", "part_title_type": "章"},
+    {"part_num": "1.1", "part_title": "1.1 主营业务", "part_title_type": "节"},
+    {"part_num": "2", "part_title": "2. 财务分析", "part_title_type": "章"},
+    {"part_num": "3", "part_title": "3. 估值与投资建议", "part_title_type": "章"},
+]
+TITLES = [part["part_title"] for part in OUTLINE]
+
+
+class StubLLM:
+    """按提示词中的章节标题返回固定正文，评审一律认为无需修改；越靠前的章节返回越慢，打乱完成顺序"""
+
+    def __init__(self):
+        self.config = SimpleNamespace(model="gpt-4", base_url="http://stub", max_tokens=8192, context_max_tokens=4000)
+
+    async def async_ask(self, messages, max_tokens=None, temperature=None, stop_at_yaml_end=False):
+        prompt = messages[-1].content
+        # 标题较长的先匹配，避免 "1. 公司概况" 之类的前缀误判
+        index = next(i for i, title in sorted(enumerate(TITLES), key=lambda x: -len(x[1])) if title in prompt)
+        await asyncio.sleep(0.01 * (len(TITLES) - index))
+        if messages[0].content == SYSTEM_PROMPT_PART_EDIT_OPINION_PART:
+            return "无"
+        return f"正文：{TITLES[index]}"
+
+
+class StubRagHelper:
+    def get_context_for_llm(self, query, max_tokens=4000, top_k=10):
+        return f"检索：{query}"
+
+
+def _make_report_info() -> ReportInfo:
+    report_info = ReportInfo("商汤科技", "数据库信息", "竞品信息")
+    report_info.report_outline = OUTLINE
+    return report_info
+
+
+def _make_pipeline(report_info: ReportInfo, concurrency: int = 2) -> ReportGenerationPipeline:
+    logger = logging.getLogger("test_section_generation")
+    llm = StubLLM()
+    pipeline = ReportGenerationPipeline.__new__(ReportGenerationPipeline)
+    pipeline.config = SimpleNamespace(section_concurrency=concurrency)
+    pipeline._logger = logger
+    pipeline._llm = llm
+    pipeline._rag_helper = StubRagHelper()
+    pipeline._agents = {
+        'section_opinion': PartOpinionGeneratorPart(logger, llm),
+        'section_edit': PartGeneratorPart(logger, llm),
+    }
+    pipeline.report_info = report_info
+    return pipeline
+
+
+def test_fork_part_isolates_section_context():
+    report_info = _make_report_info()
+    first = report_info.fork_part(OUTLINE[0], False)
+    last = report_info.fork_part(OUTLINE[-1], True)
+
+    first.cur_part_context.cur_content = "第一章正文"
+    first.cur_part_context.cur_subsection_content_opinion.append({"修改": "补充数据"})
+
+    assert last.cur_part_context.cur_content == ""
+    assert last.cur_part_context.cur_subsection_content_opinion == []
+    assert report_info.cur_part_context.cur_content == ""
+    assert report_info.cur_part_context.cur_subsection_content_opinion == []
+    assert first.cur_part_context.is_report_last is False
+    assert last.cur_part_context.is_report_last is True
+    # 大纲在各章节间共享，不被复制
+    assert first.report_outline is report_info.report_outline
+
+
+def test_generate_parts_async_keeps_outline_order():
+    report_info = _make_report_info()
+    pipeline = _make_pipeline(report_info, concurrency=len(TITLES))
+    part_infos = [report_info.fork_part(part, idx == len(OUTLINE) - 1) for idx, part in enumerate(OUTLINE)]
+
+    contents = asyncio.run(pipeline._generate_parts_async(part_infos))
+
+    assert contents == [f"正文：{title}" for title in TITLES]
+    for title, part_info in zip(TITLES, part_infos):
+        assert part_info.cur_part_context.cur_content == f"正文：{title}"
+    assert report_info.cur_part_context.cur_content == ""
+
+
+def test_generate_report_content_1_fills_leaf_sections_in_place():
+    report_info = _make_report_info()
+    pipeline = _make_pipeline(report_info)
+
+    content = pipeline.generate_report_content_1(report_info)
+
+    assert content == [
+        "## 1. 公司概况",
+        "正文：1.1 主营业务",
+        "正文：2. 财务分析",
+        "正文：3. 估值与投资建议",
+    ]